@@ -0,0 +1,822 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import Normalize
+from matplotlib.widgets import Button, Slider
+
+from mandelbrot import (
+    PASO_PREVIA,
+    TIPO_CONTEO,
+    cache_imagenes,
+    cerrojo_cache,
+    colorear,
+    generar_lote_mandelbrot,
+    generar_mandelbrot,
+    generar_mandelbrot_cacheado,
+    tipo_para_vista,
+)
+
+# ---------------------------------------------------------------------
+# Parámetros globales (usando np.float64 para máxima precisión)
+# ---------------------------------------------------------------------
+limites_originales = (
+    np.float64(-2.25),
+    np.float64(1.25),
+    np.float64(-1.5),
+    np.float64(1.5),
+)
+x_min, x_max, y_min, y_max = limites_originales
+ancho, alto = 800, 800
+iter_max = 1000  # Valor inicial; se puede modificar con el slider
+
+# ---------------------------------------------------------------------
+# iter_max efectivo según la profundidad del zoom: las vistas amplias no
+# necesitan más de ITER_BASE iteraciones para verse igual, y cada vez que
+# el ancho de la vista se reduce a la mitad se añaden ITER_POR_OCTAVA, sin
+# superar nunca el valor del slider.
+# ---------------------------------------------------------------------
+ITER_BASE = 256
+ITER_POR_OCTAVA = 100
+ANCHO_REFERENCIA = 3.5
+
+
+def iteraciones_vista(ancho_vista):
+    octavas = np.log2(max(ANCHO_REFERENCIA / ancho_vista, 1.0))
+    return int(min(iter_max, ITER_BASE + ITER_POR_OCTAVA * octavas))
+
+
+# Variables de control de la animación
+animando = False
+objetivo_pendiente = (
+    None  # Almacena el siguiente objetivo si se pulsa durante una animación
+)
+cancelar_animacion = False  # Se activa para cancelar la animación actual (por panning)
+
+# Última imagen en alta resolución mostrada: (límites, iteraciones, imagen).
+# Permite que el panning solo calcule la franja nueva de píxeles.
+ultima_imagen_completa = None
+# Última vista previa de la animación: (límites, iteraciones, imagen)
+ultima_previa = None
+# Iteraciones con las que se fijaron los límites de la barra de color
+iteraciones_mostradas = None
+
+# Render anticipado en alta resolución del objetivo de la animación en
+# curso: (límites, iteraciones, futuro). Se calcula en un hilo de fondo mientras
+# se muestran los cuadros de baja resolución.
+ejecutor_render = ThreadPoolExecutor(max_workers=1)
+render_anticipado = None
+
+# Tabla RGBA del mapa "turbo"; las imágenes se colorean con ella antes de
+# pasarlas a Matplotlib
+TABLA_COLORES = (plt.get_cmap("turbo")(np.linspace(0, 1, 1024)) * 255).astype(np.uint8)
+
+# Buffers RGBA reutilizados por colorear, uno por resolución (alta y vista
+# previa), para no reservar una imagen nueva en cada cuadro
+buffers_rgba = {}
+
+
+def colorear_imagen(imagen, iteraciones):
+    rgba = buffers_rgba.get(imagen.shape)
+    if rgba is None:
+        rgba = np.empty(imagen.shape + (4,), dtype=np.uint8)
+        buffers_rgba[imagen.shape] = rgba
+    return colorear(imagen, TABLA_COLORES, iteraciones, rgba)
+
+
+# ---------------------------------------------------------------------
+# Configuración de la figura y el eje
+# ---------------------------------------------------------------------
+figura, eje = plt.subplots(figsize=(14, 8))
+plt.subplots_adjust(left=0.1, right=0.78, bottom=0.12, top=0.95)
+eje.set_title("Conjunto de Mandelbrot")
+eje.set_xlabel("Re(c)")
+eje.set_ylabel("Im(c)")
+
+iteraciones_iniciales = iteraciones_vista(x_max - x_min)
+imagen_mandelbrot = generar_mandelbrot_cacheado(
+    x_min, x_max, y_min, y_max, ancho, alto, iteraciones_iniciales
+)
+imagen_objeto = eje.imshow(
+    colorear_imagen(imagen_mandelbrot, iteraciones_iniciales),
+    extent=(x_min, x_max, y_min, y_max),
+    interpolation="nearest",
+)
+eje.set_autoscale_on(False)
+# La imagen ya es RGBA, así que la barra de color usa su propio mapeable
+escala_colores = ScalarMappable(
+    norm=Normalize(vmin=0, vmax=iteraciones_iniciales), cmap="turbo"
+)
+cbar = figura.colorbar(escala_colores, ax=eje, fraction=0.046, pad=0.04)
+# cbar.set_label("Número de Iteraciones")
+
+
+# ---------------------------------------------------------------------
+# Función auxiliar: corrige los límites de la vista para evitar zooms extremos
+# ---------------------------------------------------------------------
+def corregir_limites_vista():
+    global x_min, x_max, y_min, y_max
+    rango_minimo = np.float64(1e-14)
+    if (x_max - x_min) < rango_minimo:
+        cx = (x_min + x_max) / 2
+        x_min = cx - rango_minimo / 2
+        x_max = cx + rango_minimo / 2
+    if (y_max - y_min) < rango_minimo:
+        cy = (y_min + y_max) / 2
+        y_min = cy - rango_minimo / 2
+        y_max = cy + rango_minimo / 2
+
+
+# ---------------------------------------------------------------------
+# Función para actualizar la imagen del fractal
+# ---------------------------------------------------------------------
+def actualizar_fractal(baja_resolucion=True):
+    global imagen_objeto, x_min, x_max, y_min, y_max
+    global ultima_imagen_completa, ultima_previa, render_anticipado
+    corregir_limites_vista()
+    limites = (x_min, x_max, y_min, y_max)
+    iteraciones = iteraciones_vista(x_max - x_min)
+    if baja_resolucion:
+        imagen = generar_previa(iteraciones)
+        ultima_previa = (limites, iteraciones, imagen)
+        mostrar_cuadro_animacion(imagen, iteraciones)
+        return
+    if render_anticipado is not None and render_anticipado[:2] == (
+        limites,
+        iteraciones,
+    ):
+        imagen = render_anticipado[2].result()
+        render_anticipado = None
+    else:
+        # La vista previa solo se reutiliza si se calculó en float64, como
+        # la imagen final (en vistas amplias las previas usan float32)
+        previa = None
+        if (
+            ultima_previa is not None
+            and ultima_previa[:2] == (limites, iteraciones)
+            and tipo_para_vista(x_min, x_max) is np.float64
+        ):
+            previa = ultima_previa[2]
+        imagen = generar_mandelbrot_cacheado(
+            x_min, x_max, y_min, y_max, ancho, alto, iteraciones, previa=previa
+        )
+    ultima_imagen_completa = (limites, iteraciones, imagen)
+    mostrar_imagen(imagen, iteraciones)
+
+
+# ---------------------------------------------------------------------
+# Vista previa de baja resolución: toma uno de cada PASO_PREVIA píxeles de
+# la malla de alta resolución (con la misma precisión), para que el cuadro
+# final de la animación la reutilice en lugar de recalcular esos puntos.
+# ---------------------------------------------------------------------
+def limites_previa(limites):
+    # Acepta unos límites (x_min, x_max, y_min, y_max) o un lote de ellos
+    limites = np.asarray(limites, dtype=np.float64)
+    res_x = (ancho + PASO_PREVIA - 1) // PASO_PREVIA
+    res_y = (alto + PASO_PREVIA - 1) // PASO_PREVIA
+    paso_x = (limites[..., 1] - limites[..., 0]) / (ancho - 1)
+    paso_y = (limites[..., 3] - limites[..., 2]) / (alto - 1)
+    previa = limites.copy()
+    previa[..., 1] = limites[..., 0] + (res_x - 1) * PASO_PREVIA * paso_x
+    previa[..., 3] = limites[..., 2] + (res_y - 1) * PASO_PREVIA * paso_y
+    return previa, res_x, res_y
+
+
+def generar_previa(iteraciones):
+    previa, res_x, res_y = limites_previa((x_min, x_max, y_min, y_max))
+    return generar_mandelbrot_cacheado(
+        *previa, res_x, res_y, iteraciones, tipo=tipo_para_vista(x_min, x_max)
+    )
+
+
+# ---------------------------------------------------------------------
+# Cuadros servidos desde la última imagen en alta resolución: si la vista
+# previa de un paso cae dentro de ella y su paso entre píxeles no es más de
+# FACTOR_MAX_CACHE veces menor que el de la imagen, se muestrea en lugar de
+# calcularse. Esos cuadros son aproximados (y conservan las iteraciones de
+# la imagen de la que salen), así que no se guardan como ultima_previa para
+# el refinamiento progresivo.
+# "completa" es el valor de ultima_imagen_completa tomado en el hilo de la
+# interfaz, ya que estas funciones también se ejecutan en el hilo de fondo.
+# ---------------------------------------------------------------------
+FACTOR_MAX_CACHE = 2
+
+
+def cuadros_desde_cache(previas, completa):
+    if completa is None:
+        return np.zeros(len(previas), dtype=bool)
+    cx_min, cx_max, cy_min, cy_max = completa[0]
+    paso_cache = (cx_max - cx_min) / (ancho - 1)
+    # La vista previa tiene un píxel cada PASO_PREVIA de la malla completa
+    paso_previa = (previas[:, 1] - previas[:, 0]) / (
+        (ancho + PASO_PREVIA - 1) // PASO_PREVIA - 1
+    )
+    margen_x = paso_cache / 2
+    margen_y = (cy_max - cy_min) / (alto - 1) / 2
+    return (
+        (previas[:, 0] >= cx_min - margen_x)
+        & (previas[:, 1] <= cx_max + margen_x)
+        & (previas[:, 2] >= cy_min - margen_y)
+        & (previas[:, 3] <= cy_max + margen_y)
+        & (paso_cache <= FACTOR_MAX_CACHE * paso_previa)
+    )
+
+
+def muestrear_cache(completa, limites, res_x, res_y):
+    (cx_min, cx_max, cy_min, cy_max), _, imagen = completa
+    columnas = np.rint(
+        (np.linspace(limites[0], limites[1], res_x) - cx_min)
+        / (cx_max - cx_min)
+        * (ancho - 1)
+    ).astype(np.intp)
+    filas = np.rint(
+        (np.linspace(limites[2], limites[3], res_y) - cy_min)
+        / (cy_max - cy_min)
+        * (alto - 1)
+    ).astype(np.intp)
+    np.clip(columnas, 0, ancho - 1, out=columnas)
+    np.clip(filas, 0, alto - 1, out=filas)
+    return imagen[filas[:, None], columnas]
+
+
+# ---------------------------------------------------------------------
+# Pasos sin cambio visible: con el suavizado cúbico los últimos pasos de una
+# animación apenas se mueven. Un paso cuyos límites difieren del último
+# cuadro calculado en menos de UMBRAL_CAMBIO_PX píxeles de la vista previa
+# repite ese cuadro en lugar de calcular uno nuevo. Devuelve, para cada
+# paso, el índice del cuadro que se muestra; el último paso es siempre el
+# suyo propio.
+# ---------------------------------------------------------------------
+UMBRAL_CAMBIO_PX = 0.5
+
+
+def cuadros_por_paso(previas, res_x, res_y):
+    mapa = np.arange(len(previas))
+    referencia = 0
+    for paso in range(1, len(previas) - 1):
+        paso_x = (previas[paso, 1] - previas[paso, 0]) / (res_x - 1)
+        paso_y = (previas[paso, 3] - previas[paso, 2]) / (res_y - 1)
+        cambio = np.abs(previas[paso] - previas[referencia])
+        if max(cambio[0], cambio[1]) / paso_x < UMBRAL_CAMBIO_PX and (
+            max(cambio[2], cambio[3]) / paso_y < UMBRAL_CAMBIO_PX
+        ):
+            mapa[paso] = referencia
+        else:
+            referencia = paso
+    return mapa
+
+
+# ---------------------------------------------------------------------
+# Animaciones por lotes: los límites de todos los pasos se conocen de
+# antemano, así que las vistas previas de una etapa se calculan en una sola
+# llamada al kernel y el bucle de animación solo las muestra.
+# Devuelve las imágenes, qué cuadros son exactos (calculados para sus
+# propios límites) y las iteraciones de cada cuadro: los calculados usan las
+# del cuadro más estrecho del lote. El último paso, que se reutiliza en el
+# cuadro final, siempre se calcula.
+# ---------------------------------------------------------------------
+def calcular_previas(lote, completa):
+    previas, res_x, res_y = limites_previa(lote)
+    iteraciones = iteraciones_vista((lote[:, 1] - lote[:, 0]).min())
+    mapa = cuadros_por_paso(previas, res_x, res_y)
+    propios = mapa == np.arange(len(previas))
+    desde_cache = cuadros_desde_cache(previas, completa) & propios
+    desde_cache[-1] = False
+    calculados = propios & ~desde_cache
+    imagenes = np.empty((len(previas), res_y, res_x), dtype=TIPO_CONTEO)
+    imagenes[calculados] = generar_lote_mandelbrot(
+        previas[calculados], res_x, res_y, iteraciones
+    )
+    for paso in np.flatnonzero(desde_cache):
+        imagenes[paso] = muestrear_cache(completa, previas[paso], res_x, res_y)
+    if desde_cache.any():
+        iteraciones = np.where(desde_cache, completa[1], iteraciones)
+    else:
+        iteraciones = np.full(len(previas), iteraciones)
+    return imagenes[mapa], calculados[mapa] & propios, iteraciones[mapa]
+
+
+def mostrar_previa(limites, imagen, iteraciones, exacta=True):
+    global x_min, x_max, y_min, y_max, ultima_previa
+    x_min, x_max, y_min, y_max = limites
+    if exacta:
+        ultima_previa = ((x_min, x_max, y_min, y_max), iteraciones, imagen)
+    mostrar_cuadro_animacion(imagen, iteraciones)
+
+
+# Solo se cambian los límites de la barra de color cuando cambian las
+# iteraciones, no en cada cuadro
+def actualizar_limites_color(iteraciones):
+    global iteraciones_mostradas
+    if iteraciones != iteraciones_mostradas:
+        escala_colores.set_clim(vmin=0, vmax=iteraciones)
+        iteraciones_mostradas = iteraciones
+
+
+def mostrar_imagen(imagen, iteraciones):
+    imagen_objeto.set_data(colorear_imagen(imagen, iteraciones))
+    imagen_objeto.set_extent((x_min, x_max, y_min, y_max))
+    actualizar_limites_color(iteraciones)
+    eje.set_xlim(x_min, x_max)
+    eje.set_ylim(y_min, y_max)
+    figura.canvas.draw_idle()
+
+
+# ---------------------------------------------------------------------
+# Cuadros intermedios de la animación: en lugar de redibujar toda la figura
+# (ejes, ticks, barra de color) se redibuja solo la imagen mediante blitting.
+# La imagen ocupa los límites actuales del eje, que no cambian hasta el
+# cuadro final en alta resolución: la extensión se fija en el primer cuadro
+# y los ticks se actualizan al terminar.
+# ---------------------------------------------------------------------
+def mostrar_cuadro_animacion(imagen, iteraciones):
+    if not figura.canvas.supports_blit:
+        mostrar_imagen(imagen, iteraciones)
+        return
+    imagen_objeto.set_data(colorear_imagen(imagen, iteraciones))
+    extension_eje = eje.get_xlim() + eje.get_ylim()
+    if tuple(imagen_objeto.get_extent()) != extension_eje:
+        imagen_objeto.set_extent(extension_eje)
+    actualizar_limites_color(iteraciones)
+    eje.draw_artist(imagen_objeto)
+    figura.canvas.blit(eje.bbox)
+
+
+def esperar_cuadro(retardo):
+    # Procesa los eventos pendientes sin forzar un redibujado completo
+    figura.canvas.start_event_loop(retardo)
+
+
+# ---------------------------------------------------------------------
+# Panning incremental: la vista se desplaza un número entero de píxeles,
+# de modo que la imagen anterior se reutiliza desplazada y solo se calcula
+# la franja de píxeles que queda al descubierto.
+# El resultado es aproximado: los píxeles reutilizados conservan las
+# coordenadas de la malla anterior, que difieren en unos ULP de las que
+# daría un render completo de los nuevos límites (y la franja recalcula su
+# paso a partir de sus propios límites). En las vistas amplias no se nota,
+# pero en los zooms profundos los píxeles caóticos del borde pueden cambiar
+# (unos cientos en "Conjunto de Julia") y una fila que cae justo sobre el
+# eje real puede pasar a estar a un ULP de él. El siguiente render completo
+# (zoom, botón o slider) vuelve a la malla exacta.
+# ---------------------------------------------------------------------
+def calcular_franja(x0, y0, paso_x, paso_y, columnas, filas, iteraciones):
+    return generar_mandelbrot(
+        x0,
+        x0 + (columnas - 1) * paso_x,
+        y0,
+        y0 + (filas - 1) * paso_y,
+        columnas,
+        filas,
+        iteraciones,
+    )
+
+
+def desplazar_vista(dx_px, dy_px):
+    global x_min, x_max, y_min, y_max, ultima_imagen_completa
+    limites_previos = (x_min, x_max, y_min, y_max)
+    paso_x = (x_max - x_min) / (ancho - 1)
+    paso_y = (y_max - y_min) / (alto - 1)
+    x_min += dx_px * paso_x
+    x_max += dx_px * paso_x
+    y_min += dy_px * paso_y
+    y_max += dy_px * paso_y
+    iteraciones = iteraciones_vista(x_max - x_min)
+    if (
+        ultima_imagen_completa is None
+        or ultima_imagen_completa[0] != limites_previos
+        or ultima_imagen_completa[1] != iteraciones
+        or abs(dx_px) >= ancho
+        or abs(dy_px) >= alto
+    ):
+        actualizar_fractal(baja_resolucion=False)
+        return
+
+    previa = ultima_imagen_completa[2]
+    y_min_previo = limites_previos[2]
+    imagen = np.empty_like(previa)
+    if dx_px > 0:
+        imagen[:, :-dx_px] = previa[:, dx_px:]
+        imagen[:, -dx_px:] = calcular_franja(
+            x_min + (ancho - dx_px) * paso_x,
+            y_min_previo,
+            paso_x,
+            paso_y,
+            dx_px,
+            alto,
+            iteraciones,
+        )
+    elif dx_px < 0:
+        imagen[:, -dx_px:] = previa[:, :dx_px]
+        imagen[:, :-dx_px] = calcular_franja(
+            x_min, y_min_previo, paso_x, paso_y, -dx_px, alto, iteraciones
+        )
+    if dx_px != 0 and dy_px != 0:
+        # Desplazamiento diagonal: el paso vertical parte de la imagen ya
+        # desplazada en horizontal (cuyas filas siguen en y_min_previo)
+        previa = imagen.copy()
+    if dy_px > 0:
+        imagen[:-dy_px, :] = previa[dy_px:, :]
+        imagen[-dy_px:, :] = calcular_franja(
+            x_min,
+            y_min + (alto - dy_px) * paso_y,
+            paso_x,
+            paso_y,
+            ancho,
+            dy_px,
+            iteraciones,
+        )
+    elif dy_px < 0:
+        imagen[-dy_px:, :] = previa[:dy_px, :]
+        imagen[:-dy_px, :] = calcular_franja(
+            x_min, y_min, paso_x, paso_y, ancho, -dy_px, iteraciones
+        )
+    ultima_imagen_completa = ((x_min, x_max, y_min, y_max), iteraciones, imagen)
+    mostrar_imagen(imagen, iteraciones)
+
+
+# ---------------------------------------------------------------------
+# Función de easing (suavizado cúbico)
+# ---------------------------------------------------------------------
+def suavizado_cubico(t):
+    return 1 - (1 - t) ** 3
+
+
+# ---------------------------------------------------------------------
+# Planificador por tiempo: la animación dura pasos * retardo segundos sin
+# importar lo que cueste cada cuadro. Si un cuadro se retrasa, se saltan
+# los pasos que ya deberían haberse mostrado; el último siempre se muestra.
+# ---------------------------------------------------------------------
+def pasos_segun_reloj(pasos, retardo):
+    duracion = pasos * retardo
+    inicio = time.perf_counter()
+    paso = -1
+    while paso < pasos - 1:
+        transcurrido = (time.perf_counter() - inicio) / duracion
+        paso = min(max(paso + 1, int(transcurrido * pasos)), pasos - 1)
+        yield paso
+
+
+# Límites de cada paso de una interpolación suavizada, uno por fila
+def interpolar_limites(limites_inicio, limites_objetivo, pasos):
+    t = suavizado_cubico(np.arange(1, pasos + 1) / pasos)[:, None]
+    return (
+        np.asarray(limites_inicio, dtype=np.float64) * (1 - t)
+        + np.asarray(limites_objetivo, dtype=np.float64) * t
+    )
+
+
+# ---------------------------------------------------------------------
+# Función de animación “estática”
+# ---------------------------------------------------------------------
+def animar_secuencia_zoom(limites_objetivo, pasos=60, retardo=0.01):
+    global objetivo_pendiente, animando, cancelar_animacion
+    animando = True
+    objetivo_actual = limites_objetivo
+    while objetivo_actual is not None:
+        objetivo_pendiente = None
+        limites_inicio = (x_min, x_max, y_min, y_max)
+        lote = interpolar_limites(limites_inicio, objetivo_actual, pasos)
+        previas, exactas, iteraciones = calcular_previas(lote, ultima_imagen_completa)
+        anticipar_render(objetivo_actual)
+        for paso in pasos_segun_reloj(pasos, retardo):
+            if cancelar_animacion:
+                cancelar_animacion = False
+                animando = False
+                return
+            mostrar_previa(lote[paso], previas[paso], iteraciones[paso], exactas[paso])
+            esperar_cuadro(retardo)
+            if objetivo_pendiente is not None:
+                break
+        actualizar_fractal(baja_resolucion=False)
+        objetivo_actual = objetivo_pendiente
+    animando = False
+
+
+# ---------------------------------------------------------------------
+# Función de animación dinámica (panning + zoom) en función de la distancia
+# ---------------------------------------------------------------------
+def animar_zoom_dinamico(limites_objetivo, pasos_totales=120, retardo=0.005):
+    """
+    Realiza una animación que primero traslada (panning) el centro de la vista
+    hasta el centro de la región objetivo (si la diferencia es significativa)
+    y luego realiza el zoom hasta llegar a 'limites_objetivo'.
+    """
+    global cancelar_animacion
+
+    # Centro actual y centro objetivo
+    centro_actual = ((x_min + x_max) / 2, (y_min + y_max) / 2)
+    centro_objetivo = (
+        (limites_objetivo[0] + limites_objetivo[1]) / 2,
+        (limites_objetivo[2] + limites_objetivo[3]) / 2,
+    )
+
+    # Distancia entre centros y ancho actual (para definir un umbral)
+    dx = centro_objetivo[0] - centro_actual[0]
+    dy = centro_objetivo[1] - centro_actual[1]
+    distancia = np.hypot(dx, dy)
+    ancho_actual = x_max - x_min
+
+    # Si la diferencia de centros es mayor que un cierto porcentaje del ancho actual,
+    # se realiza primero una animación de panning.
+    umbral_pan = ancho_actual * 0.2  # 20% del ancho actual
+    if distancia > umbral_pan:
+        # Se asignan un número de pasos para panning y zoom (se pueden ajustar)
+        pasos_pan = int(pasos_totales * 0.5)
+        pasos_zoom = pasos_totales - pasos_pan
+
+        # Etapa de panning: se interpola el centro sin cambiar el zoom actual
+        # (se mantiene el tamaño actual de la ventana).
+        mitad_ancho = ancho_actual / 2
+        mitad_alto = (y_max - y_min) / 2
+        centro_final_x = centro_actual[0] + dx
+        centro_final_y = centro_actual[1] + dy
+        limites_pan = (
+            centro_final_x - mitad_ancho,
+            centro_final_x + mitad_ancho,
+            centro_final_y - mitad_alto,
+            centro_final_y + mitad_alto,
+        )
+        lote = interpolar_limites((x_min, x_max, y_min, y_max), limites_pan, pasos_pan)
+        previas, exactas, iteraciones = calcular_previas(lote, ultima_imagen_completa)
+
+        # Etapa de zoom: se interpola desde el final del panning hasta
+        # 'limites_objetivo'. Sus vistas previas se calculan en el hilo de
+        # fondo mientras se muestran los cuadros del panning. Se encolan antes
+        # que el render anticipado: el hilo de fondo es único y, detrás de él,
+        # no estarían listas al acabar el panning.
+        lote_zoom = interpolar_limites(limites_pan, limites_objetivo, pasos_zoom)
+        previas_zoom = ejecutor_render.submit(
+            calcular_previas, lote_zoom, ultima_imagen_completa
+        )
+        anticipar_render(limites_objetivo)
+        for paso in pasos_segun_reloj(pasos_pan, retardo):
+            if cancelar_animacion:
+                cancelar_animacion = False
+                previas_zoom.cancel()
+                return
+            mostrar_previa(lote[paso], previas[paso], iteraciones[paso], exactas[paso])
+            esperar_cuadro(retardo)
+
+        lote = lote_zoom
+        previas, exactas, iteraciones = previas_zoom.result()
+        for paso in pasos_segun_reloj(pasos_zoom, retardo):
+            if cancelar_animacion:
+                cancelar_animacion = False
+                return
+            mostrar_previa(lote[paso], previas[paso], iteraciones[paso], exactas[paso])
+            esperar_cuadro(retardo)
+        actualizar_fractal(baja_resolucion=False)
+    else:
+        # Si la diferencia es pequeña, se usa la animación estática.
+        animar_secuencia_zoom(limites_objetivo, pasos=pasos_totales, retardo=retardo)
+
+
+# ---------------------------------------------------------------------
+# Lanza en segundo plano el render final del objetivo, para que esté listo
+# (o casi) cuando termine la animación. Si llega otro objetivo se cancela el
+# anterior, siempre que aún no haya empezado.
+# Las animaciones lo llaman después de calcular las vistas previas de su
+# primera etapa: los kernels comparten cerrojo_kernels y, lanzado antes, el
+# render en alta resolución retrasaría el primer cuadro hasta terminar.
+# ---------------------------------------------------------------------
+def anticipar_render(limites_objetivo):
+    global render_anticipado
+    if render_anticipado is not None:
+        render_anticipado[2].cancel()
+    limites = tuple(limites_objetivo)
+    iteraciones = iteraciones_vista(limites[1] - limites[0])
+    futuro = ejecutor_render.submit(
+        generar_mandelbrot_cacheado, *limites, ancho, alto, iteraciones
+    )
+    render_anticipado = (limites, iteraciones, futuro)
+
+
+# ---------------------------------------------------------------------
+# Función para iniciar la animación dinámica
+# ---------------------------------------------------------------------
+def iniciar_animacion_dinamica(limites_objetivo, pasos=60, retardo=0.01):
+    global animando, objetivo_pendiente
+    if animando:
+        objetivo_pendiente = limites_objetivo
+    else:
+        animando = True
+        animar_zoom_dinamico(limites_objetivo, pasos_totales=pasos, retardo=retardo)
+        animando = False
+
+
+# ---------------------------------------------------------------------
+# Función para realizar zoom (acercar o alejar) según un factor.
+# factor < 1: acercar; factor > 1: alejar.
+# ---------------------------------------------------------------------
+def zoomear(factor, pasos=20, retardo=0.01):
+    global x_min, x_max, y_min, y_max
+    centro_x = (x_min + x_max) / 2
+    centro_y = (y_min + y_max) / 2
+    ancho_actual = x_max - x_min
+    alto_actual = y_max - y_min
+    ancho_objetivo = ancho_actual * factor
+    alto_objetivo = alto_actual * factor
+    limites_objetivo = (
+        centro_x - ancho_objetivo / 2,
+        centro_x + ancho_objetivo / 2,
+        centro_y - alto_objetivo / 2,
+        centro_y + alto_objetivo / 2,
+    )
+    iniciar_animacion_dinamica(limites_objetivo, pasos, retardo)
+
+
+# ---------------------------------------------------------------------
+# Eventos de teclado:
+# - "z": acercar
+# - "x": alejar
+# - Flechas: panning (mover la vista en 2D)
+# Al pulsar una flecha se cancela la animación en curso.
+# ---------------------------------------------------------------------
+DESPLAZAMIENTO_PX = round(ancho * 0.05)  # 5% de la vista, en píxeles enteros
+
+# Dirección (dx, dy) de cada flecha, en múltiplos de DESPLAZAMIENTO_PX
+DIRECCIONES_FLECHAS = {
+    "left": (-1, 0),
+    "right": (1, 0),
+    "down": (0, 1),
+    "up": (0, -1),
+}
+
+
+# Las pulsaciones de flechas se acumulan y se aplican juntas como mucho una
+# vez cada INTERVALO_PAN_MS (unos 60 Hz). Con la tecla mantenida, los eventos
+# que llegan mientras se calcula un cuadro se agrupan en un único
+# desplazamiento en lugar de encolar un render por pulsación.
+INTERVALO_PAN_MS = 16
+desplazamiento_pendiente = [0, 0]
+temporizador_pan = figura.canvas.new_timer(interval=INTERVALO_PAN_MS)
+temporizador_pan.single_shot = True
+
+
+def aplicar_desplazamiento():
+    dx_px, dy_px = desplazamiento_pendiente
+    desplazamiento_pendiente[:] = [0, 0]
+    if dx_px or dy_px:
+        desplazar_vista(dx_px, dy_px)
+
+
+temporizador_pan.add_callback(aplicar_desplazamiento)
+
+
+def evento_teclado(event):
+    global cancelar_animacion
+    if event.key == "z":
+        zoomear(0.75)
+    elif event.key == "x":
+        zoomear(1 / 0.75)
+    elif event.key in DIRECCIONES_FLECHAS:
+        dx, dy = DIRECCIONES_FLECHAS[event.key]
+        cancelar_animacion = True
+        if desplazamiento_pendiente == [0, 0]:
+            temporizador_pan.start()
+        desplazamiento_pendiente[0] += dx * DESPLAZAMIENTO_PX
+        desplazamiento_pendiente[1] += dy * DESPLAZAMIENTO_PX
+
+
+figura.canvas.mpl_connect("key_press_event", evento_teclado)
+
+# ---------------------------------------------------------------------
+# Slider para modificar el número máximo de iteraciones (de 100 a 3000)
+# ---------------------------------------------------------------------
+eje_iter = plt.axes([0.1, 0.01, 0.55, 0.03])
+control_iter = Slider(eje_iter, "Iter Máx", 100, 5000, valinit=iter_max, valstep=10)
+
+
+# Mientras se arrastra el slider solo se muestra la vista previa; el render
+# en alta resolución se lanza cuando el valor lleva RETARDO_SLIDER_MS sin
+# cambiar. Se usa un temporizador del propio canvas para que el render se
+# ejecute en el hilo de la interfaz.
+RETARDO_SLIDER_MS = 200
+temporizador_slider = figura.canvas.new_timer(interval=RETARDO_SLIDER_MS)
+temporizador_slider.single_shot = True
+temporizador_slider.add_callback(actualizar_fractal, baja_resolucion=False)
+
+
+def actualizar_iter_max(valor):
+    global iter_max
+    iter_max = int(valor)
+    with cerrojo_cache:
+        cache_imagenes.clear()
+    reiniciar_precalculo()
+    actualizar_fractal(baja_resolucion=True)
+    temporizador_slider.stop()
+    temporizador_slider.start()
+
+
+control_iter.on_changed(actualizar_iter_max)
+
+# ---------------------------------------------------------------------
+# Botones para hacer "big zoom" a regiones predefinidas.
+# Se definen los límites con np.float64 (usando 17 dígitos cuando corresponda)
+# para explorar el fractal en profundidad. Cada región se guarda en un único
+# arreglo [x_min, x_max, y_min, y_max] en lugar de cuatro escalares sueltos.
+# ---------------------------------------------------------------------
+especificaciones_botones = [
+    (
+        "Mandelbrot Original",
+        np.array([-2.25, 1.25, -1.5, 1.5], dtype=np.float64),
+    ),
+    (
+        "Minibrot",
+        np.array([-1.943, -1.94, -0.0012, 0.0012], dtype=np.float64),
+    ),
+    (
+        "Bulb",
+        np.array([-1.764, -1.7527, -0.01925, -0.0109], dtype=np.float64),
+    ),
+    (
+        "Tentáculo",
+        np.array(
+            [
+                -1.76856260800000000,
+                -1.76856260450000000,
+                -0.00079000800000000,
+                -0.00079000500000000,
+            ],
+            dtype=np.float64,
+        ),
+    ),
+    (
+        "Conjunto de Julia",
+        np.array(
+            [
+                -1.76877930000000000,
+                -1.76877842000000000,
+                -0.00173910000000000,
+                -0.00173871000000000,
+            ],
+            dtype=np.float64,
+        ),
+    ),
+]
+
+botones = []
+for indice, (etiqueta, limites) in enumerate(especificaciones_botones):
+    eje_boton = plt.axes([0.82, 0.75 - indice * 0.07, 0.15, 0.05])
+    boton = Button(eje_boton, etiqueta)
+    # Se usa iniciar_animacion_dinamica en lugar de la función anterior
+    boton.on_clicked(
+        lambda evento, l=limites: iniciar_animacion_dinamica(l, pasos=60, retardo=0.01)
+    )
+    botones.append(boton)
+
+
+# ---------------------------------------------------------------------
+# Precálculo de las vistas de los botones en los ratos libres: cada
+# INTERVALO_PRECALCULO_MS un temporizador del canvas lanza en el hilo de
+# fondo el render de una vista pendiente, que queda en la caché de imágenes.
+# Solo se lanza si la interfaz está ociosa (sin animación, desplazamiento ni
+# otro render en curso), de modo que un clic o un desplazamiento espera como
+# mucho a un único render de precálculo.
+# ---------------------------------------------------------------------
+INTERVALO_PRECALCULO_MS = 500
+botones_sin_precalcular = []
+precalculo_en_curso = None
+temporizador_precalculo = figura.canvas.new_timer(interval=INTERVALO_PRECALCULO_MS)
+
+
+def interfaz_ociosa():
+    return (
+        not animando
+        and desplazamiento_pendiente == [0, 0]
+        and (render_anticipado is None or render_anticipado[2].done())
+        and (precalculo_en_curso is None or precalculo_en_curso.done())
+    )
+
+
+def precalcular_siguiente_boton():
+    global precalculo_en_curso
+    if not botones_sin_precalcular:
+        temporizador_precalculo.stop()
+        return
+    if not interfaz_ociosa():
+        return
+    limites = botones_sin_precalcular.pop(0)
+    iteraciones = iteraciones_vista(limites[1] - limites[0])
+    precalculo_en_curso = ejecutor_render.submit(
+        generar_mandelbrot_cacheado, *limites, ancho, alto, iteraciones
+    )
+
+
+# Vuelve a encolar todas las vistas (al arrancar y cuando el slider vacía
+# la caché)
+def reiniciar_precalculo():
+    botones_sin_precalcular[:] = [limites for _, limites in especificaciones_botones]
+    temporizador_precalculo.start()
+
+
+temporizador_precalculo.add_callback(precalcular_siguiente_boton)
+reiniciar_precalculo()
+
+# ---------------------------------------------------------------------
+# Mostrar la ventana
+# ---------------------------------------------------------------------
+plt.show()
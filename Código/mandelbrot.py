@@ -1,391 +1,488 @@
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.widgets import Button, Slider
-from numba import jit, prange
+import threading
+from collections import OrderedDict
 
+import numpy as np
+from numba import cuda, from_dtype, njit, parallel_chunksize, prange, types
 
 # ---------------------------------------------------------------------
-# Cálculo del Mandelbrot con Numba (usando float64 por defecto)
+# Cálculo del Mandelbrot con Numba (float64 en las imágenes finales; las
+# vistas previas de vistas amplias usan float32)
+# Se trabaja con la parte real e imaginaria por separado (zr, zi) en lugar
+# de números complejos, para que LLVM pueda vectorizar el bucle interno.
+# Los cuadrados zr2 y zi2 se reutilizan en la prueba de escape.
+#
+# Los píxeles de cada fila se procesan en bloques de ANCHO_BLOQUE con un
+# contador de iteraciones común y una máscara de bits de carriles activos:
+# el bloque termina en cuanto todos sus carriles han escapado, en lugar de
+# depender del píxel más lento de la fila.
+#
+# Los kernels de CPU se compilan con cache=True: el código máquina se guarda
+# en __pycache__ y las ejecuciones siguientes no vuelven a pasar por LLVM.
 # ---------------------------------------------------------------------
-@jit(nopython=True)
-def mandelbrot(complejo, iter_max):
-    z = 0j
-    for i in range(iter_max):
-        z = z * z + complejo
-        if (z.real * z.real + z.imag * z.imag) > 4.0:
-            return i
-    return iter_max
-
-
-@jit(nopython=True, parallel=True)
-def generar_mandelbrot(x_min, x_max, y_min, y_max, res_x, res_y, iter_max):
-    xs = np.linspace(x_min, x_max, res_x)
-    ys = np.linspace(y_min, y_max, res_y)
-    imagen = np.empty((res_y, res_x), dtype=np.int32)
-    for i in prange(res_y):
-        y = ys[i]
-        for j in range(res_x):
-            x = xs[j]
-            imagen[i, j] = mandelbrot(complex(x, y), iter_max)
-    return imagen
+ANCHO_BLOQUE = 8
 
 
 # ---------------------------------------------------------------------
-# Parámetros globales (usando np.float64 para máxima precisión)
+# Prueba cerrada de pertenencia al cardioide principal o al bulbo de
+# periodo 2: esos puntos nunca escapan, así que se les asigna iter_max
+# sin iterar.
 # ---------------------------------------------------------------------
-limites_originales = (
-    np.float64(-2.25),
-    np.float64(1.25),
-    np.float64(-1.5),
-    np.float64(1.5),
-)
-x_min, x_max, y_min, y_max = limites_originales
-ancho, alto = 800, 800
-iter_max = 1000  # Valor inicial; se puede modificar con el slider
-
-# Precompilamos en baja resolución
-# _ = generar_mandelbrot(x_min, x_max, y_min, y_max, 10, 10, iter_max)
-
-# Variables de control de la animación
-animando = False
-objetivo_pendiente = (
-    None  # Almacena el siguiente objetivo si se pulsa durante una animación
-)
-cancelar_animacion = False  # Se activa para cancelar la animación actual (por panning)
-
-# ---------------------------------------------------------------------
-# Configuración de la figura y el eje
-# ---------------------------------------------------------------------
-figura, eje = plt.subplots(figsize=(14, 8))
-plt.subplots_adjust(left=0.1, right=0.78, bottom=0.12, top=0.95)
-eje.set_title("Conjunto de Mandelbrot")
-eje.set_xlabel("Re(c)")
-eje.set_ylabel("Im(c)")
-
-imagen_mandelbrot = generar_mandelbrot(
-    x_min, x_max, y_min, y_max, ancho, alto, iter_max
-)
-imagen_objeto = eje.imshow(
-    imagen_mandelbrot,
-    extent=(x_min, x_max, y_min, y_max),
-    cmap="turbo",
-    interpolation="nearest",
-)
-eje.set_autoscale_on(False)
-cbar = figura.colorbar(imagen_objeto, ax=eje, fraction=0.046, pad=0.04)
-# cbar.set_label("Número de Iteraciones")
+@njit(fastmath=True, cache=True)
+def en_cardioide_o_bulbo(cr, ci):
+    ci2 = ci * ci
+    xc = cr - 0.25
+    q = xc * xc + ci2
+    if q * (q + xc) < 0.25 * ci2:
+        return True
+    return (cr + 1.0) * (cr + 1.0) + ci2 < 0.0625
 
 
-# ---------------------------------------------------------------------
-# Función auxiliar: corrige los límites de la vista para evitar zooms extremos
-# ---------------------------------------------------------------------
-def corregir_limites_vista():
-    global x_min, x_max, y_min, y_max
-    rango_minimo = np.float64(1e-14)
-    if (x_max - x_min) < rango_minimo:
-        cx = (x_min + x_max) / 2
-        x_min = cx - rango_minimo / 2
-        x_max = cx + rango_minimo / 2
-    if (y_max - y_min) < rango_minimo:
-        cy = (y_min + y_max) / 2
-        y_min = cy - rango_minimo / 2
-        y_max = cy + rango_minimo / 2
+# Coordenada del píxel "indice" a partir del paso entre píxeles. La parte
+# imaginaria se calcula fila a fila en mandelbrot_tesela, compilado sin
+# fastmath, para que la suma no se fusione en un FMA y la fila del eje real
+# (Im(c) = 0) caiga exactamente sobre él, como ocurre con np.linspace.
+@njit(cache=True)
+def coordenada(inicio, paso, indice):
+    return inicio + indice * paso
 
 
 # ---------------------------------------------------------------------
-# Función para actualizar la imagen del fractal
+# La prueba de escape se hace cada PASOS_SIN_CONTROL iteraciones: cada
+# carril avanza ese número de pasos sin comparar ni saltar y sólo después
+# se mira si ha escapado. Si es así, se repiten los pasos del tramo desde
+# el estado guardado para obtener la iteración exacta de escape.
+#
+# Entre el escape y el final del tramo z puede desbordarse a inf/nan (en
+# float32 basta con unos 7 pasos), por eso la comprobación se escribe como
+# "not (... <= 4.0)" y estos kernels no usan las banderas nnan/ninf de
+# fastmath, con las que LLVM podría suponer que nunca aparece un nan.
+#
+# Con "contract" y "reassoc" LLVM fusiona operaciones en FMA y reordena
+# sumas, así que el redondeo no es el del bucle original. En los píxeles
+# caóticos del borde la órbita amplifica esa diferencia y el conteo cambia,
+# también en float64: a 800x800 y 1000 iteraciones difieren cerca de un
+# 0,3 % de los píxeles de "Tentáculo" y "Conjunto de Julia" (a veces en
+# cientos de iteraciones) y unas decenas en "Bulb" y "Minibrot". Sin esas
+# dos banderas los conteos coinciden, pero el kernel es un 55-70 % más
+# lento. Además el tramo y su repetición pueden fusionarse de forma
+# distinta, de modo que el escape puede variar en unas pocas iteraciones
+# dentro del mismo tramo.
 # ---------------------------------------------------------------------
-def actualizar_fractal(baja_resolucion=True):
-    global imagen_objeto, x_min, x_max, y_min, y_max
-    corregir_limites_vista()
-    resolucion = (100, 100) if baja_resolucion else (ancho, alto)
-    imagen = generar_mandelbrot(
-        x_min, x_max, y_min, y_max, resolucion[0], resolucion[1], iter_max
-    )
-    imagen_objeto.set_data(imagen)
-    imagen_objeto.set_extent((x_min, x_max, y_min, y_max))
-    imagen_objeto.set_clim(vmin=0, vmax=iter_max)
-    eje.set_xlim(x_min, x_max)
-    eje.set_ylim(y_min, y_max)
-    figura.canvas.draw_idle()
-
+PASOS_SIN_CONTROL = 8
+FASTMATH_SIN_NAN = {"nsz", "arcp", "contract", "afn", "reassoc"}
 
 # ---------------------------------------------------------------------
-# Función de easing (suavizado cúbico)
+# Detección de periodicidad (Brent): cada carril guarda su z cuando n llega
+# a 8, 16, 32, 64... y al final de cada tramo compara el z actual con el
+# guardado. Si coinciden (a menos de TOLERANCIA_PERIODO en |dz|^2) dos
+# veces con el mismo z guardado, la órbita ha caído en un ciclo y el punto
+# nunca escapará: se le asigna iter_max sin agotar las iteraciones. Cubre el
+# interior de los bulbos y minibrots que la prueba del cardioide no alcanza.
+# Exigir la segunda coincidencia evita retirar órbitas casi periódicas que
+# pasan una vez muy cerca del punto guardado y escapan después (cerca del
+# borde, junto a las raíces de los bulbos); en un ciclo real la coincidencia
+# se repite a los pocos tramos.
 # ---------------------------------------------------------------------
-def suavizado_cubico(t):
-    return 1 - (1 - t) ** 3
+TOLERANCIA_PERIODO = 1e-20
+
+
+@njit(fastmath=FASTMATH_SIN_NAN, cache=True)
+def primer_escape(zr, zi, cr, ci, pasos):
+    for m in range(pasos):
+        zr2 = zr * zr
+        zi2 = zi * zi
+        if zr2 + zi2 > 4.0:
+            return m
+        zi = (zr + zr) * zi + ci
+        zr = zr2 - zi2 + cr
+    return pasos
+
+
+@njit(fastmath=FASTMATH_SIN_NAN, boundscheck=False, cache=True)
+def mandelbrot_bloque(
+    x_min, paso_x, ci, j0, j_fin, iter_max, fila, zr, zi, cr, gr, gi, paso_previa
+):
+    carriles = min(ANCHO_BLOQUE, j_fin - j0)
+    activos = 0
+    for k in range(carriles):
+        # Los píxeles ya calculados en la vista previa se conservan
+        if paso_previa > 0 and (j0 + k) % paso_previa == 0:
+            continue
+        cr[k] = coordenada(x_min, paso_x, j0 + k)
+        zr[k] = 0.0
+        zi[k] = 0.0
+        gr[k] = 0.0
+        gi[k] = 0.0
+        fila[j0 + k] = iter_max
+        if not en_cardioide_o_bulbo(cr[k], ci):
+            activos |= 1 << k
+    n = 0
+    coincidencias = 0
+    proximo_guardado = PASOS_SIN_CONTROL
+    while activos != 0 and n < iter_max:
+        pasos = min(PASOS_SIN_CONTROL, iter_max - n)
+        for k in range(carriles):
+            if activos & (1 << k):
+                a = zr[k]
+                b = zi[k]
+                c = cr[k]
+                for _ in range(pasos):
+                    a2 = a * a
+                    b2 = b * b
+                    # (a + a) evita promover a float64 con la constante 2.0
+                    b = (a + a) * b + ci
+                    a = a2 - b2 + c
+                if not (a * a + b * b <= 4.0):
+                    # m es el número de pasos tras el que z escapa. El bucle
+                    # original actualiza z antes de comprobar y devuelve el
+                    # índice de ese paso, m - 1 (a lo sumo iter_max - 1)
+                    m = n + primer_escape(zr[k], zi[k], c, ci, pasos)
+                    fila[j0 + k] = m - 1
+                    activos &= ~(1 << k)
+                else:
+                    zr[k] = a
+                    zi[k] = b
+                    dr = a - gr[k]
+                    di = b - gi[k]
+                    if dr * dr + di * di < TOLERANCIA_PERIODO:
+                        if coincidencias & (1 << k):
+                            activos &= ~(1 << k)
+                        coincidencias |= 1 << k
+        n += pasos
+        if n == proximo_guardado:
+            for k in range(carriles):
+                gr[k] = zr[k]
+                gi[k] = zi[k]
+            coincidencias = 0
+            proximo_guardado *= 2
 
 
 # ---------------------------------------------------------------------
-# Función de animación “estática”
+# Reparto en teselas: el coste por fila es muy desigual (las filas que
+# cruzan el interior del conjunto iteran iter_max en casi todos sus
+# píxeles), así que el prange recorre teselas de TAMANO_TESELA x
+# TAMANO_TESELA píxeles con un índice plano. Los lanzamientos usan
+# parallel_chunksize(1) para que cada hilo tome la siguiente tesela libre en
+# lugar de un tramo fijo de la imagen.
 # ---------------------------------------------------------------------
-def animar_secuencia_zoom(limites_objetivo, pasos=60, retardo=0.01):
-    global x_min, x_max, y_min, y_max, objetivo_pendiente, animando, cancelar_animacion
-    animando = True
-    objetivo_actual = limites_objetivo
-    while objetivo_actual is not None:
-        objetivo_pendiente = None
-        limites_inicio = (x_min, x_max, y_min, y_max)
-        for paso in range(pasos):
-            if cancelar_animacion:
-                cancelar_animacion = False
-                animando = False
-                return
-            t = suavizado_cubico((paso + 1) / pasos)
-            nuevo_x_min = limites_inicio[0] * (1 - t) + objetivo_actual[0] * t
-            nuevo_x_max = limites_inicio[1] * (1 - t) + objetivo_actual[1] * t
-            nuevo_y_min = limites_inicio[2] * (1 - t) + objetivo_actual[2] * t
-            nuevo_y_max = limites_inicio[3] * (1 - t) + objetivo_actual[3] * t
-            x_min, x_max, y_min, y_max = (
-                nuevo_x_min,
-                nuevo_x_max,
-                nuevo_y_min,
-                nuevo_y_max,
+TAMANO_TESELA = 32
+
+
+@njit(boundscheck=False, cache=True)
+def mandelbrot_tesela(
+    imagen, i0, j0, x_min, paso_x, y_min, paso_y, iter_max, tipo, paso_previa
+):
+    # Estado de los carriles del bloque, reutilizado en toda la tesela
+    zr = np.empty(ANCHO_BLOQUE, dtype=tipo)
+    zi = np.empty(ANCHO_BLOQUE, dtype=tipo)
+    cr = np.empty(ANCHO_BLOQUE, dtype=tipo)
+    gr = np.empty(ANCHO_BLOQUE, dtype=tipo)
+    gi = np.empty(ANCHO_BLOQUE, dtype=tipo)
+    i_fin = min(i0 + TAMANO_TESELA, imagen.shape[0])
+    j_fin = min(j0 + TAMANO_TESELA, imagen.shape[1])
+    for i in range(i0, i_fin):
+        ci = tipo(coordenada(y_min, paso_y, i))
+        previa_fila = paso_previa if paso_previa > 0 and i % paso_previa == 0 else 0
+        fila = imagen[i]
+        for jb in range(j0, j_fin, ANCHO_BLOQUE):
+            mandelbrot_bloque(
+                x_min,
+                paso_x,
+                ci,
+                jb,
+                j_fin,
+                iter_max,
+                fila,
+                zr,
+                zi,
+                cr,
+                gr,
+                gi,
+                previa_fila,
             )
-            actualizar_fractal(baja_resolucion=True)
-            plt.pause(retardo)
-            if objetivo_pendiente is not None:
-                break
-        actualizar_fractal(baja_resolucion=False)
-        objetivo_actual = objetivo_pendiente
-    animando = False
 
 
-# ---------------------------------------------------------------------
-# Función de animación dinámica (panning + zoom) en función de la distancia
-# ---------------------------------------------------------------------
-def animar_zoom_dinamico(limites_objetivo, pasos_totales=120, retardo=0.005):
-    """
-    Realiza una animación que primero traslada (panning) el centro de la vista
-    hasta el centro de la región objetivo (si la diferencia es significativa)
-    y luego realiza el zoom hasta llegar a 'limites_objetivo'.
-    """
-    global x_min, x_max, y_min, y_max, cancelar_animacion
-
-    # Centro actual y centro objetivo
-    centro_actual = ((x_min + x_max) / 2, (y_min + y_max) / 2)
-    centro_objetivo = (
-        (limites_objetivo[0] + limites_objetivo[1]) / 2,
-        (limites_objetivo[2] + limites_objetivo[3]) / 2,
-    )
+@njit(cache=True)
+def num_teselas(pixeles):
+    return (pixeles + TAMANO_TESELA - 1) // TAMANO_TESELA
 
-    # Distancia entre centros y ancho actual (para definir un umbral)
-    dx = centro_objetivo[0] - centro_actual[0]
-    dy = centro_objetivo[1] - centro_actual[1]
-    distancia = np.hypot(dx, dy)
-    ancho_actual = x_max - x_min
-
-    # Si la diferencia de centros es mayor que un cierto porcentaje del ancho actual,
-    # se realiza primero una animación de panning.
-    umbral_pan = ancho_actual * 0.2  # 20% del ancho actual
-    if distancia > umbral_pan:
-        # Se asignan un número de pasos para panning y zoom (se pueden ajustar)
-        pasos_pan = int(pasos_totales * 0.5)
-        pasos_zoom = pasos_totales - pasos_pan
-
-        # Etapa de panning: se interpola el centro sin cambiar el zoom actual.
-        centro_inicio = centro_actual
-        for paso in range(pasos_pan):
-            if cancelar_animacion:
-                cancelar_animacion = False
-                return
-            t = suavizado_cubico((paso + 1) / pasos_pan)
-            nuevo_centro_x = centro_inicio[0] + dx * t
-            nuevo_centro_y = centro_inicio[1] + dy * t
-            # Se mantiene el tamaño actual de la ventana
-            mitad_ancho = ancho_actual / 2
-            mitad_alto = (y_max - y_min) / 2
-            nuevo_x_min = nuevo_centro_x - mitad_ancho
-            nuevo_x_max = nuevo_centro_x + mitad_ancho
-            nuevo_y_min = nuevo_centro_y - mitad_alto
-            nuevo_y_max = nuevo_centro_y + mitad_alto
-            x_min, x_max, y_min, y_max = (
-                nuevo_x_min,
-                nuevo_x_max,
-                nuevo_y_min,
-                nuevo_y_max,
-            )
-            actualizar_fractal(baja_resolucion=True)
-            plt.pause(retardo)
-
-        # Etapa de zoom: se interpola desde la ventana actual hasta 'limites_objetivo'.
-        limites_inicio = (x_min, x_max, y_min, y_max)
-        for paso in range(pasos_zoom):
-            if cancelar_animacion:
-                cancelar_animacion = False
-                return
-            t = suavizado_cubico((paso + 1) / pasos_zoom)
-            nuevo_x_min = limites_inicio[0] * (1 - t) + limites_objetivo[0] * t
-            nuevo_x_max = limites_inicio[1] * (1 - t) + limites_objetivo[1] * t
-            nuevo_y_min = limites_inicio[2] * (1 - t) + limites_objetivo[2] * t
-            nuevo_y_max = limites_inicio[3] * (1 - t) + limites_objetivo[3] * t
-            x_min, x_max, y_min, y_max = (
-                nuevo_x_min,
-                nuevo_x_max,
-                nuevo_y_min,
-                nuevo_y_max,
-            )
-            actualizar_fractal(baja_resolucion=True)
-            plt.pause(retardo)
-        actualizar_fractal(baja_resolucion=False)
-    else:
-        # Si la diferencia es pequeña, se usa la animación estática.
-        animar_secuencia_zoom(limites_objetivo, pasos=pasos_totales, retardo=retardo)
 
+# Tipo de los conteos de iteraciones: el slider limita iter_max a 5000, que
+# cabe en 16 bits, y así se escribe la mitad de memoria por píxel. Los
+# conteos nunca son negativos, así que se usa la variante sin signo.
+TIPO_CONTEO = np.uint16
 
-# ---------------------------------------------------------------------
-# Función para iniciar la animación dinámica
-# ---------------------------------------------------------------------
-def iniciar_animacion_dinamica(limites_objetivo, pasos=60, retardo=0.01):
-    global animando, objetivo_pendiente
-    if animando:
-        objetivo_pendiente = limites_objetivo
-    else:
-        animando = True
-        animar_zoom_dinamico(limites_objetivo, pasos_totales=pasos, retardo=retardo)
-        animando = False
+# Firmas explícitas de los kernels paralelos, una por precisión. Declaran las
+# imágenes como C-contiguas ([:, ::1]) para que Numba genere accesos con
+# paso unidad, y hacen que ambas especializaciones se compilen (o se carguen
+# de la caché) al importar el módulo, antes del primer render interactivo.
+_conteo = from_dtype(TIPO_CONTEO)
+_f8, _i8 = types.float64, types.int64
+FIRMAS_GENERAR = [
+    types.void(_conteo[:, ::1], _f8, _f8, _f8, _f8, _i8, types.NumberClass(t), _i8)
+    for t in (types.float32, types.float64)
+]
+FIRMAS_LOTE = [
+    types.void(_conteo[:, :, ::1], _f8[:, ::1], _i8, types.NumberClass(t))
+    for t in (types.float32, types.float64)
+]
+
+
+@njit(FIRMAS_GENERAR, parallel=True, nogil=True, boundscheck=False, cache=True)
+def _generar_mandelbrot(
+    imagen, x_min, paso_x, y_min, paso_y, iter_max, tipo, paso_previa
+):
+    # Las coordenadas se calculan a partir del paso entre píxeles, sin
+    # reservar los arreglos de np.linspace en cada cuadro
+    teselas_y = num_teselas(imagen.shape[0])
+    teselas_x = num_teselas(imagen.shape[1])
+    for t in prange(teselas_y * teselas_x):
+        mandelbrot_tesela(
+            imagen,
+            (t // teselas_x) * TAMANO_TESELA,
+            (t % teselas_x) * TAMANO_TESELA,
+            x_min,
+            paso_x,
+            y_min,
+            paso_y,
+            iter_max,
+            tipo,
+            paso_previa,
+        )
 
 
 # ---------------------------------------------------------------------
-# Función para realizar zoom (acercar o alejar) según un factor.
-# factor < 1: acercar; factor > 1: alejar.
+# Cálculo por lotes: genera en una sola llamada todos los cuadros de una
+# animación. Las teselas de todos los cuadros se reparten juntas entre los
+# hilos, evitando una transición Python -> Numba por cuadro.
+# pasos_lote tiene una fila (x_min, paso_x, y_min, paso_y) por cuadro.
 # ---------------------------------------------------------------------
-def zoomear(factor, pasos=20, retardo=0.01):
-    global x_min, x_max, y_min, y_max
-    centro_x = (x_min + x_max) / 2
-    centro_y = (y_min + y_max) / 2
-    ancho_actual = x_max - x_min
-    alto_actual = y_max - y_min
-    ancho_objetivo = ancho_actual * factor
-    alto_objetivo = alto_actual * factor
-    limites_objetivo = (
-        centro_x - ancho_objetivo / 2,
-        centro_x + ancho_objetivo / 2,
-        centro_y - alto_objetivo / 2,
-        centro_y + alto_objetivo / 2,
-    )
-    iniciar_animacion_dinamica(limites_objetivo, pasos, retardo)
+@njit(FIRMAS_LOTE, parallel=True, nogil=True, boundscheck=False, cache=True)
+def _generar_lote(imagenes, pasos_lote, iter_max, tipo):
+    teselas_y = num_teselas(imagenes.shape[1])
+    teselas_x = num_teselas(imagenes.shape[2])
+    por_cuadro = teselas_y * teselas_x
+    for indice in prange(imagenes.shape[0] * por_cuadro):
+        f = indice // por_cuadro
+        t = indice % por_cuadro
+        mandelbrot_tesela(
+            imagenes[f],
+            (t // teselas_x) * TAMANO_TESELA,
+            (t % teselas_x) * TAMANO_TESELA,
+            pasos_lote[f, 0],
+            pasos_lote[f, 1],
+            pasos_lote[f, 2],
+            pasos_lote[f, 3],
+            iter_max,
+            tipo,
+            0,
+        )
 
 
 # ---------------------------------------------------------------------
-# Eventos de teclado:
-# - "z": acercar
-# - "x": alejar
-# - Flechas: panning (mover la vista en 2D)
-# Al pulsar una flecha se cancela la animación en curso.
+# Selección de precisión de las vistas previas y los lotes de animación:
+# mientras el ancho de la vista sea mayor que UMBRAL_FLOAT32 se usa el
+# kernel en simple precisión (el doble de carriles SIMD). Con cientos de
+# iteraciones el error de redondeo de float32 se amplifica y cambia el
+# conteo de algunos píxeles del borde, algo aceptable en un cuadro de
+# animación pero no en la imagen final, que por defecto se calcula en
+# float64 (generar_mandelbrot con tipo=None).
 # ---------------------------------------------------------------------
-def evento_teclado(event):
-    global x_min, x_max, y_min, y_max, cancelar_animacion
-    if event.key == "z":
-        zoomear(0.75)
-    elif event.key == "x":
-        zoomear(1 / 0.75)
-    elif event.key == "left":
-        cancelar_animacion = True
-        dx = (x_max - x_min) * 0.05
-        x_min -= dx
-        x_max -= dx
-        actualizar_fractal(baja_resolucion=False)
-    elif event.key == "right":
-        cancelar_animacion = True
-        dx = (x_max - x_min) * 0.05
-        x_min += dx
-        x_max += dx
-        actualizar_fractal(baja_resolucion=False)
-    elif event.key == "down":
-        cancelar_animacion = True
-        dy = (y_max - y_min) * 0.05
-        y_min += dy
-        y_max += dy
-        actualizar_fractal(baja_resolucion=False)
-    elif event.key == "up":
-        cancelar_animacion = True
-        dy = (y_max - y_min) * 0.05
-        y_min -= dy
-        y_max -= dy
-        actualizar_fractal(baja_resolucion=False)
-
-
-figura.canvas.mpl_connect("key_press_event", evento_teclado)
+UMBRAL_FLOAT32 = 1e-3
+
+# Las vistas previas de la animación muestrean la malla de alta resolución
+# cada PASO_PREVIA píxeles, de modo que el cuadro final puede reutilizarlas
+PASO_PREVIA = 8
+
+# Los kernels se compilan con nogil=True para poder calcular en un hilo de
+# fondo mientras la interfaz sigue animando. La capa de hilos por defecto de
+# Numba (workqueue) no admite lanzar kernels paralelos desde dos hilos a la
+# vez, así que los lanzamientos se serializan con este cerrojo.
+cerrojo_kernels = threading.Lock()
+
+
+# Desajuste máximo entre y_min y -y_max, relativo al alto de la vista, para
+# considerar que la vista es simétrica respecto al eje real
+TOLERANCIA_SIMETRIA = 1e-12
+
+
+def tipo_para_vista(x_min, x_max):
+    return np.float32 if (x_max - x_min) > UMBRAL_FLOAT32 else np.float64
+
+
+def generar_mandelbrot(
+    x_min, x_max, y_min, y_max, res_x, res_y, iter_max, tipo=None, previa=None
+):
+    paso_x = float(x_max - x_min) / max(res_x - 1, 1)
+    paso_y = float(y_max - y_min) / max(res_y - 1, 1)
+    if GPU_DISPONIBLE:
+        return generar_mandelbrot_cuda(
+            x_min, paso_x, y_min, paso_y, res_x, res_y, iter_max
+        )
+    if tipo is None:
+        tipo = np.float64
+    imagen = np.empty((res_y, res_x), dtype=TIPO_CONTEO)
+    paso_previa = 0
+    if previa is not None:
+        # Refinamiento progresivo: la vista previa ya contiene uno de cada
+        # PASO_PREVIA píxeles en cada eje y no se vuelven a calcular
+        imagen[::PASO_PREVIA, ::PASO_PREVIA] = previa
+        paso_previa = PASO_PREVIA
+    # Simetría respecto al eje real: si la vista está centrada en Im(c) = 0,
+    # la fila i y la fila res_y - 1 - i tienen el mismo conteo, así que solo
+    # se calcula la mitad superior y la inferior se copia en espejo
+    filas = res_y
+    if abs(y_min + y_max) <= TOLERANCIA_SIMETRIA * (y_max - y_min):
+        filas = (res_y + 1) // 2
+    with cerrojo_kernels, parallel_chunksize(1):
+        _generar_mandelbrot(
+            imagen[:filas],
+            float(x_min),
+            paso_x,
+            float(y_min),
+            paso_y,
+            iter_max,
+            tipo,
+            paso_previa,
+        )
+    imagen[filas:] = imagen[: res_y - filas][::-1]
+    return imagen
+
+
+def generar_lote_mandelbrot(limites_lote, res_x, res_y, iter_max, tipo=None):
+    limites_lote = np.asarray(limites_lote, dtype=np.float64)
+    pasos_lote = np.empty(limites_lote.shape, dtype=np.float64)
+    pasos_lote[:, 0] = limites_lote[:, 0]
+    pasos_lote[:, 1] = (limites_lote[:, 1] - limites_lote[:, 0]) / max(res_x - 1, 1)
+    pasos_lote[:, 2] = limites_lote[:, 2]
+    pasos_lote[:, 3] = (limites_lote[:, 3] - limites_lote[:, 2]) / max(res_y - 1, 1)
+    if GPU_DISPONIBLE:
+        return np.stack(
+            [
+                generar_mandelbrot_cuda(*pasos, res_x, res_y, iter_max)
+                for pasos in pasos_lote
+            ]
+        )
+    if tipo is None:
+        # La precisión la decide el cuadro más estrecho del lote
+        anchos = limites_lote[:, 1] - limites_lote[:, 0]
+        tipo = tipo_para_vista(0.0, anchos.min())
+    imagenes = np.empty((limites_lote.shape[0], res_y, res_x), dtype=TIPO_CONTEO)
+    with cerrojo_kernels, parallel_chunksize(1):
+        _generar_lote(imagenes, pasos_lote, iter_max, tipo)
+    return imagenes
+
 
 # ---------------------------------------------------------------------
-# Slider para modificar el número máximo de iteraciones (de 100 a 3000)
+# Cálculo en GPU con numba.cuda: un hilo por píxel. Si al importar el
+# módulo se detecta una GPU compatible, generar_mandelbrot delega en esta
+# versión; en caso contrario se usa el kernel de CPU.
+# Los arreglos de salida en la GPU se reservan una vez por resolución y se
+# reutilizan; la copia al host es un arreglo nuevo, así que las imágenes
+# devueltas (y las guardadas en la caché) no comparten memoria.
 # ---------------------------------------------------------------------
-eje_iter = plt.axes([0.1, 0.01, 0.55, 0.03])
-control_iter = Slider(eje_iter, "Iter Máx", 100, 5000, valinit=iter_max, valstep=10)
-
+HILOS_POR_BLOQUE = (16, 16)
+buffers_gpu = {}
+
+
+@cuda.jit
+def _mandelbrot_cuda(imagen, x_min, paso_x, y_min, paso_y, iter_max):
+    i, j = cuda.grid(2)
+    if i >= imagen.shape[0] or j >= imagen.shape[1]:
+        return
+    cr = x_min + j * paso_x
+    ci = y_min + i * paso_y
+    zr = 0.0
+    zi = 0.0
+    # Se actualiza z antes de comprobar el escape, como en el kernel de CPU
+    for n in range(iter_max):
+        zr2 = zr * zr
+        zi2 = zi * zi
+        zi = 2.0 * zr * zi + ci
+        zr = zr2 - zi2 + cr
+        if zr * zr + zi * zi > 4.0:
+            imagen[i, j] = n
+            return
+    imagen[i, j] = iter_max
+
+
+def generar_mandelbrot_cuda(x_min, paso_x, y_min, paso_y, res_x, res_y, iter_max):
+    bloques = (
+        (res_y + HILOS_POR_BLOQUE[0] - 1) // HILOS_POR_BLOQUE[0],
+        (res_x + HILOS_POR_BLOQUE[1] - 1) // HILOS_POR_BLOQUE[1],
+    )
+    # El cerrojo evita que el hilo de fondo y la interfaz compartan el buffer
+    with cerrojo_kernels:
+        imagen_gpu = buffers_gpu.get((res_y, res_x))
+        if imagen_gpu is None:
+            imagen_gpu = cuda.device_array((res_y, res_x), dtype=TIPO_CONTEO)
+            buffers_gpu[(res_y, res_x)] = imagen_gpu
+        _mandelbrot_cuda[bloques, HILOS_POR_BLOQUE](
+            imagen_gpu, x_min, paso_x, y_min, paso_y, iter_max
+        )
+        return imagen_gpu.copy_to_host()
 
-def actualizar_iter_max(valor):
-    global iter_max
-    iter_max = int(valor)
-    actualizar_fractal(baja_resolucion=False)
 
+GPU_DISPONIBLE = cuda.is_available()
 
-control_iter.on_changed(actualizar_iter_max)
 
 # ---------------------------------------------------------------------
-# Botones para hacer "big zoom" a regiones predefinidas.
-# Se definen los límites con np.float64 (usando 17 dígitos cuando corresponda)
-# para explorar el fractal en profundidad.
+# Coloreado: convierte los conteos de iteraciones en una imagen RGBA de
+# uint8 con una tabla de colores precalculada. Es un bucle secuencial (no
+# usa prange) para poder ejecutarse mientras un hilo de fondo ocupa los
+# kernels paralelos. Matplotlib recibe la imagen ya coloreada y no tiene que
+# normalizarla ni aplicar el mapa de colores en cada cuadro. El índice
+# reproduce la normalización lineal [0, iter_max] que usaría Matplotlib.
+# El resultado se escribe en rgba, un buffer que el llamador reutiliza entre
+# cuadros (set_data de Matplotlib ya hace su propia copia).
 # ---------------------------------------------------------------------
-especificaciones_botones = [
-    (
-        "Mandelbrot Original",
-        (np.float64(-2.25), np.float64(1.25), np.float64(-1.5), np.float64(1.5)),
-    ),
-    (
-        "Minibrot",
-        (
-            np.float64(-1.943),
-            np.float64(-1.94),
-            np.float64(-0.0012),
-            np.float64(0.0012),
-        ),
-    ),
-    (
-        "Bulb",
-        (
-            np.float64(-1.764),
-            np.float64(-1.7527),
-            np.float64(-0.01925),
-            np.float64(-0.0109),
-        ),
-    ),
-    (
-        "Tentáculo",
-        (
-            np.float64(-1.76856260800000000),
-            np.float64(-1.76856260450000000),
-            np.float64(-0.00079000800000000),
-            np.float64(-0.00079000500000000),
-        ),
-    ),
-    (
-        "Conjunto de Julia",
-        (
-            np.float64(-1.76877930000000000),
-            np.float64(-1.76877842000000000),
-            np.float64(-0.00173910000000000),
-            np.float64(-0.00173871000000000),
-        ),
-    ),
-]
+@njit(boundscheck=False, cache=True)
+def colorear(imagen, tabla, iter_max, rgba):
+    res_y, res_x = imagen.shape
+    colores = tabla.shape[0]
+    for i in range(res_y):
+        for j in range(res_x):
+            indice = min(imagen[i, j] * colores // iter_max, colores - 1)
+            for canal in range(4):
+                rgba[i, j, canal] = tabla[indice, canal]
+    return rgba
 
-botones = []
-for spec in especificaciones_botones:
-    etiqueta, limites = spec
-    eje_boton = plt.axes(
-        [0.82, 0.75 - especificaciones_botones.index(spec) * 0.07, 0.15, 0.05]
-    )
-    boton = Button(eje_boton, etiqueta)
-    # Se usa iniciar_animacion_dinamica en lugar de la función anterior
-    boton.on_clicked(
-        lambda evento, l=limites: iniciar_animacion_dinamica(l, pasos=60, retardo=0.01)
-    )
-    botones.append(boton)
 
 # ---------------------------------------------------------------------
-# Mostrar la ventana
+# Caché LRU de imágenes ya calculadas, indexada por (límites, iter_max,
+# resolución). Evita recalcular al volver a una vista ya visitada (por
+# ejemplo, al pulsar dos veces el mismo botón). La usan tanto la interfaz
+# como el hilo de fondo, así que los accesos se protegen con un cerrojo
+# (el cálculo en sí queda fuera de él).
 # ---------------------------------------------------------------------
-plt.show()
\ No newline at end of file
+TAMANO_CACHE = 32
+cache_imagenes = OrderedDict()
+cerrojo_cache = threading.Lock()
+
+
+def generar_mandelbrot_cacheado(
+    x_min, x_max, y_min, y_max, res_x, res_y, iter_max, tipo=None, previa=None
+):
+    clave = (
+        round(float(x_min), 14),
+        round(float(x_max), 14),
+        round(float(y_min), 14),
+        round(float(y_max), 14),
+        iter_max,
+        res_x,
+        res_y,
+    )
+    with cerrojo_cache:
+        imagen = cache_imagenes.get(clave)
+        if imagen is not None:
+            cache_imagenes.move_to_end(clave)
+    if imagen is None:
+        imagen = generar_mandelbrot(
+            x_min, x_max, y_min, y_max, res_x, res_y, iter_max, tipo, previa
+        )
+        with cerrojo_cache:
+            cache_imagenes[clave] = imagen
+            if len(cache_imagenes) > TAMANO_CACHE:
+                cache_imagenes.popitem(last=False)
+    # Se devuelve una copia para que la entrada de la caché no se modifique
+    return imagen.copy()
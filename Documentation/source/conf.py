@@ -8,6 +8,10 @@ import sys
 # Agregar la ruta donde está el código fuente para que Sphinx lo encuentre
 sys.path.insert(0, os.path.abspath('../../Código'))
 
+# app.py crea la ventana de Matplotlib al importarse; con el backend Agg
+# autodoc puede importarlo sin abrirla (plt.show no hace nada)
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
 # -- Project information -----------------------------------------------------
 project = 'Fractales en el plano complejo'
 copyright = '2025, Mateo Cumbal, Daniel Flores, Johann Pasquel, Luis Tipán'
@@ -0,0 +1,110 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+from numba import jit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "Código"))
+
+from mandelbrot import generar_lote_mandelbrot, generar_mandelbrot  # noqa: E402
+
+
+# Bucle original con números complejos, compilado con Numba como en la
+# versión inicial del proyecto: actualiza z y después comprueba el escape,
+# devolviendo el índice de la iteración (iter_max si no escapa)
+@jit(nopython=True)
+def mandelbrot_referencia(complejo, iter_max):
+    z = 0j
+    for i in range(iter_max):
+        z = z * z + complejo
+        if (z.real * z.real + z.imag * z.imag) > 4.0:
+            return i
+    return iter_max
+
+
+def generar_referencia(x_min, x_max, y_min, y_max, res_x, res_y, iter_max):
+    xs = np.linspace(x_min, x_max, res_x)
+    ys = np.linspace(y_min, y_max, res_y)
+    return np.array(
+        [[mandelbrot_referencia(complex(x, y), iter_max) for x in xs] for y in ys]
+    )
+
+
+VISTAS = [
+    # Vista inicial (simétrica respecto al eje real)
+    (-2.25, 1.25, -1.5, 1.5),
+    # Vista desplazada, sin simetría
+    (-2.0, 0.5, -0.3, 1.4),
+    # Minibrot
+    (-1.943, -1.94, -0.0012, 0.0012),
+]
+
+# Zooms profundos ("Tentáculo" y "Conjunto de Julia"). Con las banderas
+# contract y reassoc de fastmath el redondeo no es el del bucle original y
+# los píxeles caóticos del borde pueden cambiar de conteo, así que solo se
+# exige que la fracción de píxeles distintos no supere
+# FRACCION_MAX_DISTINTOS (hoy ronda el 0,25 %).
+VISTAS_PROFUNDAS = [
+    (-1.768562608, -1.7685626045, -0.000790008, -0.000790005),
+    (-1.7687793, -1.76877842, -0.0017391, -0.00173871),
+]
+FRACCION_MAX_DISTINTOS = 0.01
+
+# Puntos junto a raíces de bulbos (la cúspide del cardioide en 0.25 y el
+# "valle de los caballitos de mar" en -0.75): la órbita es casi periódica
+# durante miles de iteraciones antes de escapar, justo el caso que la
+# detección de periodicidad no debe confundir con el interior.
+PUNTOS_CASI_PERIODICOS = [
+    complex(0.250001, 0.0),
+    complex(0.2500004, 0.0),
+    complex(-0.75, 0.001),
+    complex(-0.75, 0.0008),
+    complex(-0.75, 0.00065),
+]
+
+
+class TestMandelbrot(unittest.TestCase):
+    def test_coincide_con_bucle_original(self):
+        res_x, res_y, iter_max = 48, 41, 200
+        for limites in VISTAS:
+            with self.subTest(limites=limites):
+                np.testing.assert_array_equal(
+                    generar_mandelbrot(
+                        *limites, res_x, res_y, iter_max, tipo=np.float64
+                    ),
+                    generar_referencia(*limites, res_x, res_y, iter_max),
+                )
+
+    def test_lote_coincide_con_bucle_original(self):
+        res_x, res_y, iter_max = 40, 33, 150
+        imagenes = generar_lote_mandelbrot(VISTAS, res_x, res_y, iter_max, np.float64)
+        for limites, imagen in zip(VISTAS, imagenes):
+            with self.subTest(limites=limites):
+                np.testing.assert_array_equal(
+                    imagen, generar_referencia(*limites, res_x, res_y, iter_max)
+                )
+
+    def test_zoom_profundo_dentro_de_tolerancia(self):
+        res, iter_max = 128, 1000
+        for limites in VISTAS_PROFUNDAS:
+            with self.subTest(limites=limites):
+                distintos = generar_mandelbrot(
+                    *limites, res, res, iter_max
+                ) != generar_referencia(*limites, res, res, iter_max)
+                self.assertLessEqual(distintos.mean(), FRACCION_MAX_DISTINTOS)
+
+    def test_puntos_casi_periodicos_escapan(self):
+        iter_max = 5000
+        for c in PUNTOS_CASI_PERIODICOS:
+            with self.subTest(c=c):
+                esperado = mandelbrot_referencia(c, iter_max)
+                self.assertLess(esperado, iter_max)
+                imagen = generar_mandelbrot(
+                    c.real, c.real + 1e-9, c.imag, c.imag + 1e-9, 1, 1, iter_max
+                )
+                self.assertEqual(imagen[0, 0], esperado)
+
+
+if __name__ == "__main__":
+    unittest.main()